@@ -13,10 +13,7 @@ Debuggig any of this is not for the faint of heart. Consider yourself warned.
 
 from django.conf import settings
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
-from asgiref.sync import sync_to_async, async_to_sync
-from channels.exceptions import StopConsumer
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 import logging
 import json
@@ -50,7 +47,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         self.room_id = None
 
     def first_init(self, data):
-        log.debug("first_init {}".format(data))
+        log.debug("first_init %s", data)
         # called when we actually have a room id assigned (hopefully)
         self.room_id = data
 
@@ -63,7 +60,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         Should be called when the websocket closes for any reason.
         I really, really hope this is true.
         """
-        log.debug("{} disconnect {}".format(self.room_id, close_data))
+        log.debug("%s disconnect %s", self.room_id, close_data)
 
         self.handle_incoming({
             "type": "disconnect"
@@ -73,7 +70,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
     async def handle_outgoing(self, data):
         # with the data we recieve from the GameScheduler,
         # send it through the websocket
-        log.debug("Got data {}".format(data))
+        log.debug("Got data %s", data)
         if getattr(self, 'room_id', False):
             await self.send(text_data=data)
         else:
@@ -87,7 +84,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
     async def receive_json(self, content):
         # with the data we recieve from the websocket,
         # send it to the GameScheduler
-        log.debug("Receiving json {}".format(content))
+        log.debug("Receiving json %s", content)
         if getattr(self, 'room_id', False):
             self.handle_incoming(content)
         else:
@@ -2,7 +2,9 @@
 # welp guess no one will ever know how it works then
 
 import asyncio
+import collections
 import logging
+import traceback
 
 log = logging.getLogger(__name__)
 
@@ -14,6 +16,10 @@ class GameSchedulerClient(asyncio.Protocol):
         self.reg_callback = reg_callback
         self.disconnect_callback = disconnect_callback
         self.has_received = False
+        # messages waiting to be handed to a coroutine reg_callback, and the
+        # one task that hands them over in order
+        self.pending = collections.deque()
+        self.pending_task = None
         log.debug("Made GameSchedulerClient")
 
     def connection_made(self, transport):
@@ -26,13 +32,17 @@ class GameSchedulerClient(asyncio.Protocol):
         self.first_callback is usually the room setting callback, and the other
         one is the general data handling callback
         """
-        log.debug("Received data {}".format(data))
+        log.debug("Received data %s", data)
         decoded_data = data.decode('utf-8').strip()
         
         # Handle case where multiple message were bundled together
         # Ordering is still guaranteed
-        for sub_data in decoded_data.split("\n"):
-            self._handle_received(sub_data)
+        messages = decoded_data.split("\n")
+        if not self.has_received:
+            self._call_asyncio_with_magic(self.first_callback, messages.pop(0))
+            self.has_received = True
+        if messages:
+            self._handle_received(messages)
 
     def _call_asyncio_with_magic(self, func, *args):
         """
@@ -40,19 +50,40 @@ class GameSchedulerClient(asyncio.Protocol):
         and handle accordingly.
 
         lots of asyncio magic here, be careful
+
+        Protocol callbacks always run inside the event loop, so regular
+        callables can use plain call_soon instead of call_soon_threadsafe,
+        which would wake the loop up through its self-pipe every time.
         """
         if asyncio.iscoroutinefunction(func):
             self.loop.create_task(func(*args))
         else:
-            self.loop.call_soon_threadsafe(func, *args) 
+            self.loop.call_soon(func, *args)
 
 
-    def _handle_received(self, decoded_data):
-        if self.has_received:
-            self._call_asyncio_with_magic(self.reg_callback, decoded_data)
+    def _handle_received(self, messages):
+        """
+        Coroutine callbacks get all their messages through a single task
+        that awaits them one after the other, instead of a new task per
+        message that could end up sending out of order.
+        """
+        if asyncio.iscoroutinefunction(self.reg_callback):
+            self.pending.extend(messages)
+            if self.pending_task is None:
+                self.pending_task = self.loop.create_task(self._handle_pending())
         else:
-            self._call_asyncio_with_magic(self.first_callback, decoded_data)
-            self.has_received = True
+            for message in messages:
+                self.loop.call_soon(self.reg_callback, message)
+
+    async def _handle_pending(self):
+        try:
+            while self.pending:
+                try:
+                    await self.reg_callback(self.pending.popleft())
+                except Exception:
+                    log.error(traceback.format_exc())
+        finally:
+            self.pending_task = None
 
     def connection_lost(self, exc):
         log.debug("Lost connection")
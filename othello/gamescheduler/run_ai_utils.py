@@ -14,6 +14,9 @@ from .othello_admin import Strategy
 from .othello_core import BLACK, WHITE, EMPTY
 
 ORIGINAL_SYS = sys.path[:]
+# Explicitly fork, since spawn and forkserver would have to re-import
+# and pickle the student's Strategy on every single move
+MP_CTX = mp.get_context('fork')
 
 log = logging.getLogger(__name__)
 
@@ -39,7 +42,7 @@ class LocalRunner:
         try:
             self.strat, self.new_path, self.new_sys = get_strat(self.name)
         except:
-            log.warn("LocalRunner threw exception when importing {}. Traceback below".format(ai_name))
+            log.warn("LocalRunner threw exception when importing %s. Traceback below", ai_name)
             traceback.print_exc()
             self.strat = None
 
@@ -60,14 +63,14 @@ class LocalRunner:
         if self.strat is None:
             return -5, "Failed to load Strategy"
 
-        best_shared = mp.Value("i", -7)
-        running = mp.Value("i", 1)
+        best_shared = MP_CTX.Value("i", -7)
+        running = MP_CTX.Value("i", 1)
 
         os.chdir(self.new_path)
         sys.path = self.new_sys
-        to_child, to_self = mp.Pipe()
+        to_child, to_self = MP_CTX.Pipe()
         try:
-            p = mp.Process(target=self.strat_wrapper, args=("".join(list(board)), player, best_shared, running, to_child))
+            p = MP_CTX.Process(target=self.strat_wrapper, args=("".join(list(board)), player, best_shared, running, to_child))
             p.start()
             p.join(timelimit)
             if p.is_alive():
@@ -115,7 +118,7 @@ class JailedRunner:
         timelimit = client_in.readline().strip()
         player = client_in.readline().strip()
         board = client_in.readline().strip()
-        log.debug("Got data {} {} {} {}".format(name, timelimit, player, board))
+        log.debug("Got data %s %s %s %s", name, timelimit, player, board)
 
         if name == self.name and \
            (player == BLACK or player == WHITE):
@@ -133,7 +136,7 @@ class JailedRunner:
 
             if err is not None: client_err.write(err)
 
-            log.debug("Got move {}".format(move))
+            log.debug("Got move %s", move)
             client_out.write(str(move)+"\n")
         else:
             log.debug("Data not ok")
@@ -157,10 +160,15 @@ class JailedRunnerCommunicator:
     if core.is_legal(board, move): core.make_flips(board, move)
     ...
     ai.stop()
+
+    get_move can also be split up into request_move and receive_move, so the
+    AI can start thinking while we do something else.
     """
     def __init__(self, ai_name):
         self.name = ai_name
         self.proc = None
+        # (timelimit, errors) for a move that was requested but not received yet
+        self.pending_request = None
         log.debug("JailedRunnerCommunicator created")
 
     def start(self):
@@ -182,12 +190,26 @@ class JailedRunnerCommunicator:
         Gets a move from the running subprocess, providing it with all the data it
         needs to make a decision.
 
+        `board` can be given as either a list or an already joined string.
+        """
+        self.request_move(board, player, timelimit)
+        return self.receive_move()
+
+    def request_move(self, board, player, timelimit):
+        """
+        Sends the subprocess everything it needs to start working on a move,
+        without waiting for it to answer. Use receive_move to get the answer.
+
         Data format needs to be same as JailedRunner expects it, namely,
         b"duv\n5\n@\n?????..??o@?????\n"
+
+        `board` can be given as either a list or an already joined string.
         """
-        data = self.name+"\n"+str(timelimit)+"\n"+player+"\n"+''.join(board)+"\n"
+        if not isinstance(board, str):
+            board = ''.join(board)
+        data = self.name+"\n"+str(timelimit)+"\n"+player+"\n"+board+"\n"
 
-        log.debug('About to send {} to subprocess'.format(repr(data)))
+        log.debug('About to send %r to subprocess', data)
         """
         x = "Debug:"
         while x:
@@ -208,6 +230,16 @@ class JailedRunnerCommunicator:
         self.proc.stdin.flush()
         log.debug("Done writing data")
 
+        self.pending_request = (timelimit, errs)
+
+    def receive_move(self):
+        """
+        Waits for the subprocess to answer the last request_move, and
+        returns the move along with any errors it printed.
+        """
+        timelimit, errs = self.pending_request
+        self.pending_request = None
+
         # this needs to be .get() in order to block until queue has something,
         # i.e. process is finished. Trusting JailedRunner to always output, but
         # just in case, actually do time out
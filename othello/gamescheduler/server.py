@@ -20,10 +20,11 @@ import json
 import traceback
 import datetime
 
-from .worker import GameRunner
-from .utils import generate_id
-from .settings import OTHELLO_AI_UNKNOWN_PLAYER, OTHELLO_GAME_MAX_TIME, \
-        OTHELLO_GAME_MAX_TIMEDELTA 
+from .worker import GameRunner, QUIT_SENTINEL
+from .utils import generate_id, safe_int
+from .settings import OTHELLO_GAME_MAX_TIME, \
+        OTHELLO_GAME_MAX_TIMEDELTA, OTHELLO_GAME_MAX_THREADS, \
+        OTHELLO_BOARD_UPDATE_DELAY
 from .cron_scheduler import CronScheduler
 
 log = logging.getLogger(__name__)
@@ -43,7 +44,11 @@ class Room:
         self.game = None
         self.queue = None
         self.task = None
-        self.executor = None
+
+        # latest board update that hasn't been sent yet, and the
+        # asyncio.TimerHandle that will send it
+        self.pending_board = None
+        self.board_flush = None
 
         self.started_when = datetime.datetime.utcnow()
 
@@ -63,6 +68,10 @@ class GameScheduler(asyncio.Protocol):
         super().__init__()
         self.loop = loop
         self.rooms = dict()
+        # One pool of threads shared by every game, instead of a new
+        # executor (and thread) being made and torn down for each game.
+        # Games hold their thread until they end, see OTHELLO_GAME_MAX_THREADS
+        self.executor = ThreadPoolExecutor(max_workers=OTHELLO_GAME_MAX_THREADS)
 
         self.cron_scheduler = CronScheduler(self.loop)
         self.cron_scheduler.schedule_periodic(
@@ -80,12 +89,12 @@ class GameScheduler(asyncio.Protocol):
         room.id = new_id
         room.transport = transport
         self.rooms[new_id] = room
-        log.debug("{} assigning room id".format(new_id))
+        log.debug("%s assigning room id", new_id)
         transport.write((new_id+'\n').encode('utf-8'))
         self.check_room_validity(new_id)
 
     def gamerunner_emit_callback(self, event):
-        log.debug("Got data from subprocess: {}".format(event))
+        log.debug("Got data from subprocess: %s", event)
         msg_type = event.get('type', None)
         room_id = event.get('room_id', None)
         if not msg_type or not room_id:
@@ -108,7 +117,7 @@ class GameScheduler(asyncio.Protocol):
         self.check_room_validity(room_id)
         if type(data) is str:
             data = data.encode('utf-8')
-        log.debug("{} will receive data {}".format(room_id, data))
+        log.debug("%s will receive data %s", room_id, data)
 
         # Add newline to seperate out data in case multiple methods become
         # buffered into one message
@@ -116,7 +125,7 @@ class GameScheduler(asyncio.Protocol):
 
         if room_id not in self.rooms:
             # changing to debug b/c this happens so often
-            log.debug("{} does not exist anymore! ignoring b/c probably already killed".format(room_id))
+            log.debug("%s does not exist anymore! ignoring b/c probably already killed", room_id)
             return
 
         # don't send to a client that's disconnected
@@ -126,16 +135,21 @@ class GameScheduler(asyncio.Protocol):
                 # Early return because this closes all the watching ones anyway
                 return
             else:
-                log.debug("{} writing to transport".format(room_id))
+                log.debug("%s writing to transport", room_id)
                 self.rooms[room_id].transport.write(data)
 
+        # Most rooms don't have anyone watching them, so skip all the
+        # watcher bookkeeping for those
+        if not self.rooms[room_id].watching:
+            return
+
         for watching_id in self.rooms[room_id].watching:
             # same here, don't send to disconnected ppl
             if watching_id in self.rooms and self.rooms[watching_id].transport:
                 if self.rooms[watching_id].transport.is_closing():
                     self.game_end_actual(watching_id)
                 else:
-                    log.debug("{} writing to watching transport".format(room_id))
+                    log.debug("%s writing to watching transport", room_id)
                     self.rooms[watching_id].transport.write(data)
 
         self.rooms[room_id].watching = [w_id for w_id in self.rooms[room_id].watching if w_id in self.rooms]
@@ -145,12 +159,12 @@ class GameScheduler(asyncio.Protocol):
         self._send(json_data, room_id)
 
     def data_received(self, data):
-        log.debug("Received data {}".format(data))
+        log.debug("Received data %s", data)
         # taking HUGE assumption here that all data is properly line-buffered
         # should mostly work out tho, the packets are tiny
         parsed_data = None
         parsed_data = json.loads(data.decode('utf-8').strip())
-        log.debug("Parsed data in {}".format(parsed_data))
+        log.debug("Parsed data in %s", parsed_data)
 
         if not (parsed_data is None):
             room_id = parsed_data.get('room_id', None)
@@ -197,30 +211,28 @@ class GameScheduler(asyncio.Protocol):
         if black_ai is None or \
           white_ai is None or \
           timelimit is None:
-            log.info("{} Play request was invalid! ignoring...".format(room_id))
+            log.info("%s Play request was invalid! ignoring...", room_id)
             return
 
-        log.info("{} Playing game: {} v {}".format(room_id, black_ai, white_ai))
+        log.info("%s Playing game: %s v %s", room_id, black_ai, white_ai)
         self.play_game_actual(black_ai, white_ai, timelimit, room_id)
 
     def play_game_actual(self, black_ai, white_ai, timelimit, room_id):
         game = GameRunner(black_ai, white_ai, timelimit, \
             self.loop, room_id, self.gamerunner_emit_callback)
-        q = queue.Queue()
-        executor = ThreadPoolExecutor()
+        q = queue.SimpleQueue()
 
         self.rooms[room_id].black_ai = black_ai
         self.rooms[room_id].white_ai = white_ai
         self.rooms[room_id].timelimit = timelimit
         self.rooms[room_id].game = game
         self.rooms[room_id].queue = q
-        self.rooms[room_id].executor = executor
         self.rooms[room_id].started_when = datetime.datetime.utcnow()
         # here's where the **magic** happens. Tasks should be scheduled to run automatically
-        log.debug("{} Starting game {} v {} ({})".format(
+        log.debug("%s Starting game %s v %s (%s)",
             room_id, black_ai, white_ai, timelimit
-        ))
-        self.rooms[room_id].task = self.loop.run_in_executor(executor, game.run, q)
+        )
+        self.rooms[room_id].task = self.loop.run_in_executor(self.executor, game.run, q)
         self.rooms[room_id].task.add_done_callback(
                 lambda fut: self.game_end(dict(), room_id)
         )
@@ -229,13 +241,13 @@ class GameScheduler(asyncio.Protocol):
 
     def watch_game(self, parsed_data, room_id):
         self.check_room_validity(room_id)
-        log.debug("{} watch_game".format(room_id))
+        log.debug("%s watch_game", room_id)
         id_to_watch = parsed_data.get('watching', None)
         if id_to_watch is None:
-            log.info("{} Watch request was invalid! ignoring...".format(room_id))
+            log.info("%s Watch request was invalid! ignoring...", room_id)
             return
         if id_to_watch not in self.rooms:
-            log.warn("{} wants to watch game {}, but it doesn't exist!".format(room_id, id_to_watch))
+            log.warn("%s wants to watch game %s, but it doesn't exist!", room_id, id_to_watch)
             return
 
         self.rooms[id_to_watch].watching.append(room_id)
@@ -243,12 +255,12 @@ class GameScheduler(asyncio.Protocol):
     def move_reply(self, parsed_data, room_id):
         self.check_room_validity(room_id)
         if self.rooms[room_id].queue:
-            move = parsed_data.get('move', -1)
-            log.debug("{} move_reply {}".format(room_id, move))
+            move = safe_int(parsed_data.get('move', -1))
+            log.debug("%s move_reply %s", room_id, move)
             self.rooms[room_id].queue.put_nowait(move)
         else:
             # don't have a queue to put in to
-            log.warn("{} has no queue to put move {} into!".format(room_id, parsed_data))
+            log.warn("%s has no queue to put move %s into!", room_id, parsed_data)
 
     # From GameRunner to server
 
@@ -258,15 +270,25 @@ class GameScheduler(asyncio.Protocol):
         Called when there is an update on the board
         that we need to send to the client
         """
-        log.debug("{} board_update {}".format(room_id, event))
-        self._send_json({
-            'type': 'reply',
-            'board': event.get('board', ""),
-            'tomove': event.get('tomove', "?"),
-            'black': event.get('black', OTHELLO_AI_UNKNOWN_PLAYER),
-            'white': event.get('white', OTHELLO_AI_UNKNOWN_PLAYER),
-            'bSize': '8',
-        }, room_id)
+        log.debug("%s board_update %s", room_id, event)
+        if room_id not in self.rooms:
+            log.debug("%s does not exist anymore! ignoring board update", room_id)
+            return
+
+        payload = event.get('payload', None)
+        if payload is None:
+            log.warn("%s board update had no payload! ignoring...", room_id)
+            return
+
+        # Don't send right away, fast games can make a bunch of moves in a
+        # very short time and only the latest board actually matters.
+        # GameRunner already serialized the payload for us, so just pass it on
+        room = self.rooms[room_id]
+        room.pending_board = payload
+        if room.board_flush is None:
+            room.board_flush = self.loop.call_later(
+                OTHELLO_BOARD_UPDATE_DELAY, self.flush_board_update, room_id
+            )
 
     def move_request(self, event, room_id):
         self.check_room_validity(room_id)
@@ -274,7 +296,8 @@ class GameScheduler(asyncio.Protocol):
         Called when the game wants the user to input a move.
         Sends out a similar call to the client
         """
-        log.debug("{} move_request {}".format(room_id, event))
+        log.debug("%s move_request %s", room_id, event)
+        self.flush_board_update(room_id)
         self._send_json({'type':"moverequest"}, room_id)
 
     def game_error(self, event, room_id):
@@ -283,7 +306,8 @@ class GameScheduler(asyncio.Protocol):
         Called whenever the AIs/server errors out for whatever reason.
         Could be used in place of game_end
         """
-        log.debug("{} game_error {}".format(room_id, event))
+        log.debug("%s game_error %s", room_id, event)
+        self.flush_board_update(room_id)
         self._send_json({
             'type': "gameerror",
             'error': event.get('error', "No error"),
@@ -292,14 +316,15 @@ class GameScheduler(asyncio.Protocol):
 
     def game_end(self, event, room_id):
         if room_id not in self.rooms:
-            log.debug("{} getting ended twice".format(room_id))
+            log.debug("%s getting ended twice", room_id)
             return
         self.check_room_validity(room_id)
         """
         Called when the game has ended, tells client that message too.
         Really should log the result but doesn't yet.
         """
-        log.debug("{} game_end {}".format(room_id, event))
+        log.debug("%s game_end %s", room_id, event)
+        self.flush_board_update(room_id)
         self._send_json({
             'type': "gameend",
             'winner': event.get('winner', "?"),
@@ -310,23 +335,41 @@ class GameScheduler(asyncio.Protocol):
    
     # General utility methods
 
+    def flush_board_update(self, room_id):
+        """
+        Sends the latest board update waiting to be sent, if there is one.
+        Has to be called before sending anything else to the room so that
+        messages stay in order.
+        """
+        if room_id not in self.rooms: return
+        room = self.rooms[room_id]
+        if room.board_flush:
+            room.board_flush.cancel()
+            room.board_flush = None
+        if room.pending_board:
+            pending_board = room.pending_board
+            room.pending_board = None
+            self._send(pending_board, room_id)
+
     def game_end_actual(self, room_id):
-        log.debug("{} attempting to end".format(room_id))
+        log.debug("%s attempting to end", room_id)
         if room_id not in self.rooms: return
-        log.debug("{} actually ending".format(room_id))
+        log.debug("%s actually ending", room_id)
+
+        if self.rooms[room_id].board_flush:
+            self.rooms[room_id].board_flush.cancel()
 
         if self.rooms[room_id].game:
-            log.debug("{} setting do_quit to True".format(room_id))
-            with self.rooms[room_id].game.do_quit_lock:
-                self.rooms[room_id].game.do_quit = True
-            log.debug("{} cancelling task".format(room_id))
+            log.debug("%s setting do_quit to True", room_id)
+            self.rooms[room_id].game.do_quit.set()
+            # wake up the GameRunner if it's blocked waiting for a move
+            self.rooms[room_id].queue.put_nowait(QUIT_SENTINEL)
+            log.debug("%s cancelling task", room_id)
             self.rooms[room_id].task.cancel()
-            log.debug("{} shutting down executor".format(room_id))
-            self.rooms[room_id].executor.shutdown(wait=True)
 
-        log.debug("{} shutting down transport?".format(room_id))
+        log.debug("%s shutting down transport?", room_id)
         if self.rooms[room_id].transport:
-            log.debug("{} yes, shutting down transport".format(room_id))
+            log.debug("%s yes, shutting down transport", room_id)
             self.rooms[room_id].transport.close()
         # avoiding any cylcical bs
         watching = self.rooms[room_id].watching.copy()
@@ -337,7 +380,7 @@ class GameScheduler(asyncio.Protocol):
     def check_room_validity(self, room_id):
         try:
             if room_id not in self.rooms:
-                log.debug("{} wasn't in self.rooms!".format(room_id))
+                log.debug("%s wasn't in self.rooms!", room_id)
                 return False
             # Basic typing checks
             room = self.rooms[room_id]
@@ -350,8 +393,7 @@ class GameScheduler(asyncio.Protocol):
             #    assert(w_id in self.rooms)
             assert(room.transport is None or isinstance(room.transport, asyncio.BaseTransport))
             assert(room.game is None or isinstance(room.game, GameRunner))
-            assert(room.queue is None or isinstance(room.queue, queue.Queue))
-            assert(room.executor is None or isinstance(room.executor, ThreadPoolExecutor))
+            assert(room.queue is None or isinstance(room.queue, queue.SimpleQueue))
             assert(room.task is None or isinstance(room.task, asyncio.Future))
             assert(isinstance(room.started_when, datetime.datetime))
 
@@ -361,22 +403,20 @@ class GameScheduler(asyncio.Protocol):
                 assert(not (room.black_ai is None))
                 assert(not (room.white_ai is None))
                 assert(not (room.queue is None))
-                assert(not (room.executor is None))
                 assert(not (room.task is None))
 
                 # Checks to make sure things are shutting down correctly
-                with room.game.do_quit_lock:
-                    if room.game.do_quit:
-                        assert(room.task.done())
-                        assert(room.transport is None or room.transport.is_closing())
-                    
-                    if room.task.done():
-                        assert(room.game.do_quit)
-                        assert(room.transport is None or room.transport.is_closing())
-
-                    if not (room.transport is None) and room.transport.is_closing():
-                        assert(room.game.do_quit)
-                        assert(room.task.done())
+                if room.game.do_quit.is_set():
+                    assert(room.task.done())
+                    assert(room.transport is None or room.transport.is_closing())
+                
+                if room.task.done():
+                    assert(room.game.do_quit.is_set())
+                    assert(room.transport is None or room.transport.is_closing())
+
+                if not (room.transport is None) and room.transport.is_closing():
+                    assert(room.game.do_quit.is_set())
+                    assert(room.task.done())
 
             return True
         except AssertionError:
@@ -397,7 +437,7 @@ class GameScheduler(asyncio.Protocol):
             room = self.rooms[room_id]
 
             if current_time > room.started_when + OTHELLO_GAME_MAX_TIMEDELTA:
-                log.error("{} timed out! please figure out why.".format(room_id))
+                log.error("%s timed out! please figure out why.", room_id)
                 rooms_to_remove.append(room_id)
 
         for room_id in rooms_to_remove:
@@ -24,6 +24,15 @@ OTHELLO_AI_RUN_COMMAND = "firejail --quiet --profile={0} --whitelist={1} --read-
 OTHELLO_AI_MAX_TIME = 60
 OTHELLO_GAME_MAX_TIME = OTHELLO_AI_MAX_TIME * 75 # fairly arbitrary, don't want to limit people's games too much
 OTHELLO_GAME_MAX_TIMEDELTA = datetime.timedelta(seconds=OTHELLO_GAME_MAX_TIME)
+# Size of the thread pool games run in. Every running game holds a thread for
+# its whole length, including games waiting on a human to move (which can sit
+# until OTHELLO_GAME_MAX_TIME), and a game past this limit waits without the
+# client being told anything. So keep this way above how many games could
+# ever be going at once; threads are only made when no idle one is around.
+OTHELLO_GAME_MAX_THREADS = 4096
+# seconds to hold on to a board update, so that many quick moves only get
+# sent to the client as the latest board
+OTHELLO_BOARD_UPDATE_DELAY = 0.03
 
 SCHEDULER_HOST = "127.0.0.1"
 SCHEDULER_PORT = 13770
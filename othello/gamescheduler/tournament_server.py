@@ -82,7 +82,7 @@ class AutomaticGameScheduler(GameScheduler):
 
     def play_game(self, parsed_data, room_id):
         # send an error message back telling them they can't play
-        log.warn("{} tried to play during a tournament".format(room_id))
+        log.warn("%s tried to play during a tournament", room_id)
         self.game_error({'error': "You cannot start a game during a tournament."}, room_id)
         self.game_end(dict(), room_id)
 
@@ -104,20 +104,20 @@ class AutomaticGameScheduler(GameScheduler):
         new_id = generate_id()
         # extremely low chance to block, ~~we take those~~
         while new_id in self.rooms: new_id = generate_id()
-        log.info("{} playing next game: {} v {}".format(new_id, black, white))
+        log.info("%s playing next game: %s v %s", new_id, black, white)
         room = Room()
         room.id = new_id
         self.rooms[new_id] = room
-        log.debug("{} starting to play".format(new_id))
+        log.debug("%s starting to play", new_id)
         self.play_game_actual(black, white, timelimit, new_id)
 
         return new_id
 
     def game_end(self, parsed_data, room_id):
-        log.debug("{} overridded game_end called".format(room_id))
+        log.debug("%s overridded game_end called", room_id)
         # log result
         if room_id not in self.rooms:
-            log.debug("{} tried to end room, which might've already ended".format(room_id))
+            log.debug("%s tried to end room, which might've already ended", room_id)
             return
 
         board = parsed_data.get('board', "")
@@ -129,7 +129,7 @@ class AutomaticGameScheduler(GameScheduler):
         white_ai = self.rooms[room_id].white_ai
 
         if black_ai is None or white_ai is None:
-            log.info("{} ignoring room with blank AI...".format(room_id))
+            log.info("%s ignoring room with blank AI...", room_id)
             return
 
         super().game_end(parsed_data, room_id)
@@ -185,7 +185,7 @@ class SetTournamentScheduler(AutomaticGameScheduler):
 
     def unsafe_log_game(self, room_id, black_ai, white_ai, black_score, white_score, winner, by_forfeit):
         with self.games_lock:
-            log.info("{} game over {} v {}".format(room_id, black_ai, white_ai))
+            log.info("%s game over %s v %s", room_id, black_ai, white_ai)
             if room_id in self.games:
                 game = self.games[room_id]
                 game.black = get_player(black_ai)
@@ -272,7 +272,7 @@ class SetTournamentScheduler(AutomaticGameScheduler):
                 else:
                     next_set.black = black_prev_set.white
             else:
-                log.warn("Set {}'s black previous set ({}) does not have a pointer to it".format(next_set_index, black_prev_set.num))
+                log.warn("Set %s's black previous set (%s) does not have a pointer to it", next_set_index, black_prev_set.num)
 
         if not (next_set.white_from_set is None):
             white_prev_set = next_set.white_from_set
@@ -291,7 +291,7 @@ class SetTournamentScheduler(AutomaticGameScheduler):
                 else:
                     next_set.white = white_prev_set.white
             else:
-                log.warn("Set {}'s white previous set ({}) does not have a pointer to it".format(next_set_index, white_prev_set.num))
+                log.warn("Set %s's white previous set (%s) does not have a pointer to it", next_set_index, white_prev_set.num)
         
         safely_call(next_set.save)
 
@@ -328,9 +328,9 @@ class SetTournamentScheduler(AutomaticGameScheduler):
         new_currently_playing = self.currently_playing.copy()
         for i in self.currently_playing:
             s = self.sets[i]
-            log.debug("{}".format(s))
+            log.debug("%s", s)
             num_games = safely_call(count_completed_games, s)
-            log.debug("num_completed_games: {}".format(num_games))
+            log.debug("num_completed_games: %s", num_games)
             if num_games >= 2*self.games_per_set:
                 s.completed = True
                 safely_call(calc_set_winner, s)
@@ -390,8 +390,8 @@ class SwissTournamentScheduler(SetTournamentScheduler):
             self.last_recorded_index = len(self.sets)
             # Sort by number of wins
             ranking = sorted(self.ai_list, key=lambda ai: -self.num_wins.get(ai, 0))
-            log.info("Swiss ranking: {}".format(ranking))
-            log.info("Num wins: {}".format(self.num_wins))
+            log.info("Swiss ranking: %s", ranking)
+            log.info("Num wins: %s", self.num_wins)
             for i in range(0, len(ranking), 2):
                 black = ranking[i]
                 if i+1 >= len(ranking):
@@ -1,7 +1,8 @@
 import os, sys
 from threading import Thread, Lock
-from queue import Queue, Empty
+from queue import SimpleQueue, Empty
 import importlib
+import functools
 import random
 import string
 
@@ -21,9 +22,9 @@ def enqueue_stream_helper(stream, q, event):
 
 def get_stream_queue(stream, event):
     """
-    Takes in a stream, and returns a Queue that will return the output from that stream. Starts a background thread as a side effect.
+    Takes in a stream, and returns a SimpleQueue that will return the output from that stream. Starts a background thread as a side effect.
     """
-    q = Queue()
+    q = SimpleQueue()
     t = Thread(target=enqueue_stream_helper, args=(stream, q, event))
     t.daemon = True # Dies with the main program
     t.start()
@@ -50,23 +51,34 @@ def get_strat(name):
     return strat, new_path, new_sys
 
 def get_possible_strats():
+    # Adding or removing an AI folder changes the mtime of the student folder,
+    # so only rescan it when that changes
+    return _get_possible_strats_cached(os.stat(OTHELLO_STUDENT_PATH).st_mtime_ns)
+
+@functools.lru_cache(maxsize=1)
+def _get_possible_strats_cached(mtime):
     folders = os.listdir(OTHELLO_STUDENT_PATH)
-    possible_names =  {x for x in folders if \
+    possible_names =  frozenset(x for x in folders if \
         x != '__pycache__' and \
         os.path.isdir(os.path.join(OTHELLO_STUDENT_PATH, x))
-    }
+    )
     return possible_names
 
 def generate_id(size=10, chars=string.ascii_letters + string.digits):
     return ''.join(random.choice(chars) for _ in range(size))
 
 def safe_int(s):
+    # values parsed from JSON are usually already ints
+    if type(s) is int:
+        return s
     try:
         return int(s)
     except:
         return -1
 
 def safe_float(s):
+    if type(s) is float:
+        return s
     try:
         return float(s)
     except:
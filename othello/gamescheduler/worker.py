@@ -4,8 +4,9 @@ import shlex, traceback
 import multiprocessing as mp
 import subprocess
 import time
-from threading import Lock
-from queue import Empty
+import json
+import weakref
+from threading import Lock, Event
 
 from .run_ai_utils import JailedRunnerCommunicator
 from .othello_admin import Strategy
@@ -15,6 +16,23 @@ from .settings import OTHELLO_AI_HUMAN_PLAYER
 
 log = logging.getLogger(__name__)
 
+# Put on a GameRunner's move queue to wake it up when the game should stop
+QUIT_SENTINEL = object()
+
+# Strategy doesn't keep any state between calls, so every game can share one,
+# along with a starting board to copy from
+CORE = Strategy()
+INITIAL_BOARD = CORE.initial_board()
+
+def stop_strats(strats):
+    """
+    Last resort for stopping a GameRunner's AIs if it was never cleaned up.
+    Only takes the strats so it doesn't keep the GameRunner itself alive.
+    """
+    for strat in strats.values():
+        if strat is not None:
+            strat.stop()
+
 class GameRunner:
     def __init__(self, black, white, timelimit, loop, room_id, emit_callback):
         self.black = black
@@ -23,18 +41,43 @@ class GameRunner:
         self.room_id = room_id
         self.loop = loop
         self.emit_callback = emit_callback
+        self.names = {
+            BLACK: self.black,
+            WHITE: self.white,
+        }
+
+        # Everything in a board update besides the board and who's moving
+        # stays the same all game, so serialize that part once up front
+        self.board_update_suffix = json.dumps({
+            'black': self.black,
+            'white': self.white,
+            'bSize': '8',
+        })[1:]
 
         self.possible_names = get_possible_strats()
         self.strats = dict()
-        self.do_quit = False
-        self.do_quit_lock = Lock()
+        self.do_quit = Event()
         self.has_cleanuped = False
+        # just in case of wonkiness, cleanup() detaches this when it runs
+        self.finalizer = weakref.finalize(self, stop_strats, self.strats)
 
     def emit(self, data):
-        log.debug("GameRunner emmitting {}".format(data))
+        log.debug("GameRunner emmitting %s", data)
         data['room_id'] = self.room_id
         self.loop.call_soon_threadsafe(self.emit_callback, data)
 
+    def emit_board_update(self, board_str, tomove):
+        """
+        Emits a board update with the JSON to send to the client already
+        filled in, so the server can pass it along as-is.
+        """
+        self.emit({
+            "type": "board.update",
+            "payload": '{{"type": "reply", "board": "{}", "tomove": {}, {}'.format(
+                board_str, json.dumps(tomove), self.board_update_suffix
+            ),
+        })
+
     def run(self, in_q):
         try:
             self._run(in_q)
@@ -50,13 +93,14 @@ class GameRunner:
         Does not have multiprocess support, expects to be run inside a thread
         """
         # NOTE: on any exit from this function, you MUST call self.cleanup()
-        log.debug("GameRunner started to run {} vs {} ({})".format(
+        log.debug("GameRunner started to run %s vs %s (%s)",
             self.black,
             self.white,
             self.timelimit
-        ))
+        )
 
-        self.strats = dict()
+        # clear instead of replacing, the finalizer holds on to this dict
+        self.strats.clear()
         do_start_game = True
 
         if self.black not in self.possible_names:
@@ -94,40 +138,28 @@ class GameRunner:
             self.cleanup()
             return
 
-        core = Strategy()
+        core = CORE
         player = BLACK
-        board = core.initial_board()
-        names = {
-            BLACK: self.black,
-            WHITE: self.white,
-        }
+        board = INITIAL_BOARD.copy()
 
         # first check to see if we should still emit
-        with self.do_quit_lock:
-            if self.do_quit:
-                log.debug("Quitting early")
-                self.cleanup()
-                return
+        if self.do_quit.is_set():
+            log.debug("Quitting early")
+            self.cleanup()
+            return
 
-        self.emit({
-            "type": "board.update",
-            "board": ''.join(board),
-            "tomove": BLACK,
-            "black": names[BLACK],
-            "white": names[WHITE],
-        })
+        self.emit_board_update(''.join(board), BLACK)
         forfeit = False
 
         log.debug("All initing done, time to start playing the game")
 
         while player is not None and not forfeit:
             # another check before each tick
-            with self.do_quit_lock:
-                if self.do_quit:
-                    log.debug("Quitting while running game")
-                    self.cleanup()
-                    return
-            player, board, forfeit = self.do_game_tick(in_q, core, board, player, names)
+            if self.do_quit.is_set():
+                log.debug("Quitting while running game")
+                self.cleanup()
+                return
+            player, board, forfeit = self.do_game_tick(in_q, core, board, player)
 
         winner = EMPTY
         if forfeit:
@@ -137,23 +169,17 @@ class GameRunner:
 
 
         # final check before game ends (just in case ya know)
-        with self.do_quit_lock:
-            if self.do_quit:
-                log.debug("Quit at final check")
-                self.cleanup()
-                return
+        if self.do_quit.is_set():
+            log.debug("Quit at final check")
+            self.cleanup()
+            return
 
-        self.emit({
-            "type": "board.update",
-            "board": ''.join(board),
-            "tomove": EMPTY,
-            "black": names[BLACK],
-            "white": names[WHITE],
-        })
+        board_str = ''.join(board)
+        self.emit_board_update(board_str, EMPTY)
         self.emit({
             "type": "game.end",
             "winner": winner,
-            "board": ''.join(board),
+            "board": board_str,
             "forfeit": forfeit,
         })
 
@@ -184,12 +210,9 @@ class GameRunner:
             log.debug("successfully stopped WHITE jailed runner")
 
         self.has_cleanuped = True
+        self.finalizer.detach()
 
-    # just in case of wonkiness
-    def __del__(self):
-        self.cleanup(False)
-
-    def do_game_tick(self, in_q, core, board, player, names):
+    def do_game_tick(self, in_q, core, board, player):
         """
         Runs one move in a game, handling all the board flips and game-ending edge cases.
 
@@ -197,49 +220,48 @@ class GameRunner:
         """
         log.debug("Ticking game")
         strat = self.strats[player]
+        # only join the board once, it's used for the AI and any errors
+        board_str = ''.join(board)
         move = -1
         errs = None
         if strat is None:
             self.emit({"type":"move.request"})
-            waiting_for_move = True
-            move = None
-            # Using a timeout on the move queue so we can detect
-            # if we are supposed to stop while we are waiting for the move
-            while waiting_for_move:
-                try:
-                    move = in_q.get(timeout=1)
-                    waiting_for_move = False
-                except Empty:
-                    with self.do_quit_lock:
-                        if self.do_quit:
-                            log.debug("Quitting in middle of waiting for move")
-                            self.cleanup()
-                            # Cause the outer loop to continue, but return 
-                            # prematurely b/c we are in the process of quitting
-                            return player, board, False
+            # Blocks until we get a move, or until the server tells us to
+            # stop by putting QUIT_SENTINEL on the queue
+            move = in_q.get()
+            if move is QUIT_SENTINEL:
+                log.debug("Quitting in middle of waiting for move")
+                self.cleanup()
+                # Cause the outer loop to continue, but return 
+                # prematurely b/c we are in the process of quitting
+                return player, board, False
         else:
-            move, errs = strat.get_move(board, player, self.timelimit)
+            # the move might have already been requested at the end of the
+            # last tick
+            if strat.pending_request is None:
+                strat.request_move(board_str, player, self.timelimit)
+            move, errs = strat.receive_move()
 
         if errs:
             self.emit({
                 'type': "game.error",
-                'error': "{} error on board {}:\n{}\n".format(names[player], ''.join(board), errs)
+                'error': "{} error on board {}:\n{}\n".format(self.names[player], board_str, errs)
             })
 
         if not core.is_legal(move, player, board):
             self.emit({
                 'type': "game.error",
-                'error': "{}: {} is an invalid move for board {}\n".format(names[player], move, ''.join(board))
+                'error': "{}: {} is an invalid move for board {}\n".format(self.names[player], move, board_str)
             })
             return player, board, True
 
         board = core.make_move(move, player, board)
         player = core.next_player(board, player)
-        self.emit({
-            "type": "board.update",
-            "board": ''.join(board),
-            "tomove": player,
-            "black": names[BLACK],
-            "white": names[WHITE],
-        })
+        board_str = ''.join(board)
+        # Get the next AI started on its move right away, no need for it to
+        # wait on us sending out the board
+        next_strat = self.strats.get(player, None)
+        if next_strat is not None:
+            next_strat.request_move(board_str, player, self.timelimit)
+        self.emit_board_update(board_str, player)
         return player, board, False